@@ -1,14 +1,34 @@
-import statistics
+import heapq
 from collections import deque
+from itertools import count, islice
+
+import numpy as np
+
+from workload import ProcessArray, generate_smart_workload
+
+try:
+    from numba import njit
+except ImportError:  # Optional: without numba every scheduler runs as plain Python
+    njit = None
 
 # --- BASE CLASS ---
 class Scheduler:
     def __init__(self, name, processes):
         self.name = name
-        self.processes = processes 
+        # Own copies: schedulers built from the same dataset never touch each other's state
+        self.processes = [p.clone() for p in processes]
+        # Arrival order never changes, so sort once for every run()
+        self._sorted_procs = sorted(self.processes, key=lambda x: x.arrival_time)
         self.completed_processes = []
         self.context_switches = 0 # NEW METRIC
 
+    def reset(self):
+        # Every run starts from the initial state, not whatever the last run left
+        for p in self.processes:
+            p.reset_state()
+        self.completed_processes = []
+        self.context_switches = 0
+
     def run(self):
         pass 
 
@@ -20,22 +40,28 @@ class FCFS(Scheduler):
         super().__init__("FCFS", processes)
 
     def run(self):
+        self.reset()
         time = 0
-        queue = []
-        procs = sorted(self.processes, key=lambda x: x.arrival_time)
+        queue = deque()
+        procs = self._sorted_procs
+        n_procs = len(procs)
+        n_total = len(self.processes)
+        completed = 0
         p_idx = 0
         
-        while len(self.completed_processes) < len(self.processes):
-            while p_idx < len(procs) and procs[p_idx].arrival_time <= time:
+        while completed < n_total:
+            while p_idx < n_procs and procs[p_idx].arrival_time <= time:
                 queue.append(procs[p_idx])
                 p_idx += 1
             
             if not queue:
-                time += 1
+                # CPU idle: jump straight to the next arrival
+                if p_idx == n_procs: break
+                time = procs[p_idx].arrival_time
                 continue
 
             self.context_switches += 1 # Count Switch
-            p = queue.pop(0)
+            p = queue.popleft()
             if p.start_time == -1: p.start_time = time
             
             burst = p.remaining_time
@@ -49,6 +75,7 @@ class FCFS(Scheduler):
             else:
                 p.completion_time = time
                 self.completed_processes.append(p)
+                completed += 1
 
 # ---------------------------------------------------------
 # 2. SJF (Non-Pre)
@@ -58,24 +85,30 @@ class SJF(Scheduler):
         super().__init__("SJF (Non-Pre)", processes)
 
     def run(self):
+        self.reset()
         time = 0
+        # Min-heap of (remaining_time, seq, process); seq keeps ties in FIFO order
         queue = []
-        procs = sorted(self.processes, key=lambda x: x.arrival_time)
+        seq = count()
+        procs = self._sorted_procs
+        n_procs = len(procs)
+        n_total = len(self.processes)
+        completed = 0
         p_idx = 0
         
-        while len(self.completed_processes) < len(self.processes):
-            while p_idx < len(procs) and procs[p_idx].arrival_time <= time:
-                queue.append(procs[p_idx])
+        while completed < n_total:
+            while p_idx < n_procs and procs[p_idx].arrival_time <= time:
+                heapq.heappush(queue, (procs[p_idx].remaining_time, next(seq), procs[p_idx]))
                 p_idx += 1
             
             if not queue:
-                time += 1
+                # CPU idle: jump straight to the next arrival
+                if p_idx == n_procs: break
+                time = procs[p_idx].arrival_time
                 continue
 
-            queue.sort(key=lambda x: x.remaining_time)
-            
             self.context_switches += 1
-            p = queue.pop(0)
+            _, _, p = heapq.heappop(queue)
             if p.start_time == -1: p.start_time = time
             
             burst = p.remaining_time
@@ -85,10 +118,11 @@ class SJF(Scheduler):
             p.current_burst_index += 1
             if p.current_burst_index < len(p.bursts):
                 p.remaining_time = p.bursts[p.current_burst_index]
-                queue.append(p) 
+                heapq.heappush(queue, (p.remaining_time, next(seq), p))
             else:
                 p.completion_time = time
                 self.completed_processes.append(p)
+                completed += 1
 
 # ---------------------------------------------------------
 # 3. SRTF (Preemptive)
@@ -98,46 +132,58 @@ class SRTF(Scheduler):
         super().__init__("SRTF (Preemptive)", processes)
 
     def run(self):
+        self.reset()
         time = 0
+        # Min-heap of (remaining_time, seq, process); seq keeps ties in FIFO order
         queue = []
-        procs = sorted(self.processes, key=lambda x: x.arrival_time)
+        seq = count()
+        procs = self._sorted_procs
+        n_procs = len(procs)
+        n_total = len(self.processes)
+        completed = 0
         p_idx = 0
         current_p = None
         
-        while len(self.completed_processes) < len(self.processes):
-            while p_idx < len(procs) and procs[p_idx].arrival_time <= time:
-                queue.append(procs[p_idx])
+        while completed < n_total:
+            while p_idx < n_procs and procs[p_idx].arrival_time <= time:
+                heapq.heappush(queue, (procs[p_idx].remaining_time, next(seq), procs[p_idx]))
                 p_idx += 1
             
             if current_p and current_p.remaining_time > 0:
-                queue.append(current_p)
+                heapq.heappush(queue, (current_p.remaining_time, next(seq), current_p))
                 current_p = None
                 
             if not queue:
-                time += 1
+                # CPU idle: jump straight to the next arrival
+                if p_idx == n_procs: break
+                time = procs[p_idx].arrival_time
                 continue
 
-            queue.sort(key=lambda x: x.remaining_time)
+            _, _, current_p = heapq.heappop(queue)
             
-            # Check if we are switching to a DIFFERENT process
-            if not current_p or current_p != queue[0]:
-                 self.context_switches += 1
+            if current_p.start_time == -1: current_p.start_time = time
             
-            current_p = queue.pop(0)
+            # Nothing can preempt the shortest job before the next arrival,
+            # so run it up to that event (or to the end of its burst) at once
+            run_time = current_p.remaining_time
+            if p_idx < n_procs:
+                run_time = min(run_time, procs[p_idx].arrival_time - time)
             
-            if current_p.start_time == -1: current_p.start_time = time
+            # Switches are counted per tick, same as the tick-by-tick loop did
+            self.context_switches += run_time
             
-            time += 1
-            current_p.remaining_time -= 1
+            time += run_time
+            current_p.remaining_time -= run_time
             
             if current_p.remaining_time == 0:
                 current_p.current_burst_index += 1
                 if current_p.current_burst_index < len(current_p.bursts):
                     current_p.remaining_time = current_p.bursts[current_p.current_burst_index]
-                    queue.append(current_p)
+                    heapq.heappush(queue, (current_p.remaining_time, next(seq), current_p))
                 else:
                     current_p.completion_time = time
                     self.completed_processes.append(current_p)
+                    completed += 1
                 current_p = None
 
 # ---------------------------------------------------------
@@ -149,27 +195,34 @@ class PriorityRR(Scheduler):
         self.quantum = quantum
 
     def run(self):
+        self.reset()
         time = 0
-        queue = []
-        procs = sorted(self.processes, key=lambda x: x.arrival_time)
+        procs = self._sorted_procs
+        n_procs = len(procs)
+        n_total = len(self.processes)
+        completed = 0
+        # One FIFO per priority level (lower number = higher priority)
+        buckets = [deque() for _ in range(max((p.priority for p in procs), default=0) + 1)]
         p_idx = 0
         current_p_runtime = 0 
         
-        while len(self.completed_processes) < len(self.processes):
-            while p_idx < len(procs) and procs[p_idx].arrival_time <= time:
-                queue.append(procs[p_idx])
+        while completed < n_total:
+            while p_idx < n_procs and procs[p_idx].arrival_time <= time:
+                buckets[procs[p_idx].priority].append(procs[p_idx])
                 p_idx += 1
             
-            if not queue:
-                time += 1
+            # Highest-priority level that has work
+            queue = next((b for b in buckets if b), None)
+            if queue is None:
+                # CPU idle: jump straight to the next arrival
+                if p_idx == n_procs: break
+                time = procs[p_idx].arrival_time
                 continue
-
-            queue.sort(key=lambda x: x.priority) 
             
             # Simplified Switch Counting: Increment on every pop
             self.context_switches += 1
             
-            p = queue.pop(0) 
+            p = queue.popleft() 
             if p.start_time == -1: p.start_time = time
             
             time += 1
@@ -183,43 +236,113 @@ class PriorityRR(Scheduler):
                 p.current_burst_index += 1
                 if p.current_burst_index < len(p.bursts):
                     p.remaining_time = p.bursts[p.current_burst_index]
-                    queue.append(p)
+                    buckets[p.priority].append(p)
                 else:
                     p.completion_time = time
                     self.completed_processes.append(p)
+                    completed += 1
             
             if not finished:
                 if current_p_runtime >= self.quantum:
                     current_p_runtime = 0
-                    queue.append(p)
+                    buckets[p.priority].append(p)
                 else:
-                    queue.insert(0, p) # Stay at head (no switch cost theoretically, but simplified here)
+                    buckets[p.priority].appendleft(p) # Stay at head (no switch cost theoretically, but simplified here)
 
 # ---------------------------------------------------------
 # 5. Round Robin
 # ---------------------------------------------------------
+def _run_rr_kernel(arrival, burst_offsets, bursts, burst_index, remaining, start, completion, quantum):
+    # Same loop as RoundRobin.run, over ProcessArray columns (sorted by arrival).
+    # Each process is queued at most once, so a ring buffer of n slots suffices.
+    # Returns (context switches, indices in completion order).
+    n = arrival.shape[0]
+    ring = np.empty(n, dtype=np.int64)
+    head = 0
+    size = 0
+    done = np.empty(n, dtype=np.int64)
+    completed = 0
+    time = 0
+    p_idx = 0
+    switches = 0
+    
+    while completed < n:
+        while p_idx < n and arrival[p_idx] <= time:
+            ring[(head + size) % n] = p_idx
+            size += 1
+            p_idx += 1
+        
+        if size == 0:
+            if p_idx == n: break
+            time = arrival[p_idx]
+            continue
+        
+        switches += 1
+        i = ring[head]
+        head = (head + 1) % n
+        size -= 1
+        if start[i] == -1: start[i] = time
+        
+        run_time = min(remaining[i], quantum)
+        time += run_time
+        remaining[i] -= run_time
+        
+        if remaining[i] == 0:
+            burst_index[i] += 1
+            if burst_offsets[i] + burst_index[i] < burst_offsets[i + 1]:
+                remaining[i] = bursts[burst_offsets[i] + burst_index[i]]
+                ring[(head + size) % n] = i
+                size += 1
+            else:
+                completion[i] = time
+                done[completed] = i
+                completed += 1
+        else:
+            ring[(head + size) % n] = i
+            size += 1
+    
+    return switches, done[:completed]
+
+_run_rr_compiled = njit(cache=True)(_run_rr_kernel) if njit is not None else None
+
 class RoundRobin(Scheduler):
     def __init__(self, processes, quantum):
         super().__init__(f"Round Robin (Q={quantum})", processes)
         self.quantum = quantum
 
     def run(self):
+        self.reset()
+        if _run_rr_compiled is not None:
+            self._run_kernel(_run_rr_compiled)
+        else:
+            self._run_python()
+
+    def _run_python(self):
         time = 0
-        queue = []
-        procs = sorted(self.processes, key=lambda x: x.arrival_time)
+        queue = deque()
+        procs = self._sorted_procs
+        n_procs = len(procs)
+        n_total = len(self.processes)
+        completed = 0
         p_idx = 0
+        next_arrival = procs[0].arrival_time if procs else float('inf')
         
-        while len(self.completed_processes) < len(self.processes):
-            while p_idx < len(procs) and procs[p_idx].arrival_time <= time:
-                queue.append(procs[p_idx])
-                p_idx += 1
+        while completed < n_total:
+            # Only scan for arrivals once the next one is actually due
+            if time >= next_arrival:
+                while p_idx < n_procs and procs[p_idx].arrival_time <= time:
+                    queue.append(procs[p_idx])
+                    p_idx += 1
+                next_arrival = procs[p_idx].arrival_time if p_idx < n_procs else float('inf')
             
             if not queue:
-                time += 1
+                # CPU idle: jump straight to the next arrival
+                if p_idx == n_procs: break
+                time = next_arrival
                 continue
 
             self.context_switches += 1
-            p = queue.pop(0)
+            p = queue.popleft()
             if p.start_time == -1: p.start_time = time
             
             run_time = min(p.remaining_time, self.quantum)
@@ -234,73 +357,174 @@ class RoundRobin(Scheduler):
                 else:
                     p.completion_time = time
                     self.completed_processes.append(p)
+                    completed += 1
             else:
                 queue.append(p)
 
+    def _run_kernel(self, kernel):
+        # kernel: _run_rr_compiled, or the plain _run_rr_kernel (see check_rr_kernel)
+        procs = self._sorted_procs
+        arr = ProcessArray(procs)
+        switches, order = kernel(arr.arrival, arr.burst_offsets, arr.bursts, arr.burst_index,
+                                 arr.remaining, arr.start, arr.completion, self.quantum)
+        arr.store_results(procs)
+        self.context_switches += int(switches)
+        self.completed_processes.extend(procs[i] for i in order.tolist())
+
+def check_rr_kernel(n=200, seed=0, quanta=(1, 5, 20)):
+    """Asserts that _run_rr_kernel and RoundRobin's Python loop produce the same schedule."""
+    # Only one of the two ever runs in a given environment, so compare them
+    # directly; the kernel runs uncompiled here, numba is not needed
+    dataset = generate_smart_workload(n=n, seed=seed)
+    for quantum in quanta:
+        python_rr = RoundRobin(dataset, quantum)
+        python_rr.reset()
+        python_rr._run_python()
+        kernel_rr = RoundRobin(dataset, quantum)
+        kernel_rr.reset()
+        kernel_rr._run_kernel(_run_rr_kernel)
+        
+        schedules = [[(p.pid, p.start_time, p.completion_time, p.current_burst_index)
+                      for p in rr.completed_processes] for rr in (python_rr, kernel_rr)]
+        assert schedules[0] == schedules[1], f"RR(Q={quantum}): schedules differ"
+        assert python_rr.context_switches == kernel_rr.context_switches, \
+            f"RR(Q={quantum}): {python_rr.context_switches} vs {kernel_rr.context_switches} context switches"
+
 # ---------------------------------------------------------
 # 6. FEMTO-WINDOW (FIXED LOGIC)
 # ---------------------------------------------------------
+def _summarize_window(window):
+    # Single pass over a non-empty window:
+    # (length, sum, min, max, newest burst, strictly increasing?)
+    if len(window) == 5:
+        # Full default-size window: unrolled, trend as one chained comparison
+        # (a strictly increasing window also gives min and max for free)
+        a, b, c, d, e = window
+        if a < b < c < d < e:
+            return 5, a + b + c + d + e, a, e, e, True
+        min_v = max_v = a
+        for v in (b, c, d, e):
+            if v < min_v: min_v = v
+            elif v > max_v: max_v = v
+        return 5, a + b + c + d + e, min_v, max_v, e, False
+    
+    total = min_v = max_v = prev = window[0]
+    is_increasing = True
+    for v in islice(window, 1, None):
+        total += v
+        if v < min_v: min_v = v
+        elif v > max_v: max_v = v
+        if v <= prev: is_increasing = False
+        prev = v
+    return len(window), total, min_v, max_v, prev, is_increasing
+
+def _femto_predict_kernel(window, accumulated):
+    # Pure arithmetic over the burst window (no process object involved)
+    # FIX: Prediction must account for accumulated time
+    if not window:
+        return max(5, accumulated + 5)
+    
+    length, total, min_v, max_v, last, is_increasing = _summarize_window(window)
+    avg = total / length
+    range_var = max_v - min_v
+    
+    prediction = avg
+    if range_var < (avg * 0.20): 
+        prediction = avg
+    elif is_increasing: 
+        prediction = last * 1.2
+    else: 
+        prediction = max_v
+        
+    # FIX: Never predict less than what has already happened in this burst
+    return max(prediction, accumulated + 2)
+
+def _femto_predict_batch(stats, accumulated):
+    # Same decision tree as _femto_predict_kernel, for many processes at once.
+    # Each row of stats is a _summarize_window() result (all zeros = no history).
+    length, total, min_v, max_v, last, is_increasing = stats.T
+    avg = total / np.maximum(length, 1)
+    
+    prediction = np.where(max_v - min_v < avg * 0.20, avg,
+                          np.where(is_increasing > 0, last * 1.2, max_v))
+    prediction = np.maximum(prediction, accumulated + 2)
+    return np.where(length == 0, np.maximum(5, accumulated + 5), prediction)
+
 class FemtoScheduler(Scheduler):
     def __init__(self, processes):
         super().__init__("Femto-Window AI", processes)
         self.WINDOW_SIZE = 5
-        # Ensure accumulator is reset
-        for p in self.processes:
-            p.current_burst_accumulated = 0
+        self.reset() # Window state is usable before the first run()
 
-    def femto_predict(self, p):
-        # FIX: Prediction must account for accumulated time
-        if not p.burst_history:
-            return max(5, p.current_burst_accumulated + 5)
+    def reset(self):
+        super().reset()
         
-        window = p.burst_history[-self.WINDOW_SIZE:]
-        avg = statistics.mean(window)
-        min_v, max_v = min(window), max(window)
+        # Per-process window statistics (one row each), refreshed only when a
+        # burst finishes, so the quantum is computed for the whole ready queue
+        # with NumPy instead of re-scanning every window on every dispatch
+        n = len(self.processes)
+        self.window_stats = np.zeros((n, 6))
+        self.accumulated = np.zeros(n)
         
-        is_increasing = all(x < y for x, y in zip(window, window[1:]))
-        range_var = max_v - min_v
-        
-        prediction = avg
-        if range_var < (avg * 0.20): 
-            prediction = avg
-        elif is_increasing: 
-            prediction = window[-1] * 1.2
-        else: 
-            prediction = max_v
-            
-        # FIX: Never predict less than what has already happened in this burst
-        return max(prediction, p.current_burst_accumulated + 2)
+        for row, p in enumerate(self.processes):
+            # Ring buffer: only the last WINDOW_SIZE bursts are ever looked at
+            p.burst_history = deque(maxlen=self.WINDOW_SIZE)
+            p.femto_row = row
+
+    def femto_predict(self, p):
+        return _femto_predict_kernel(p.burst_history, p.current_burst_accumulated)
+
+    def record_burst(self, p, burst):
+        p.burst_history.append(burst)
+        self.window_stats[p.femto_row] = _summarize_window(p.burst_history)
 
     def calculate_system_quantum(self, ready_queue):
         if not ready_queue: return 5
-        predictions = [self.femto_predict(p) for p in ready_queue]
-        if not predictions: return 5
-        median = statistics.median(predictions)
+        rows = np.fromiter((p.femto_row for p in ready_queue), dtype=np.intp, count=len(ready_queue))
+        predictions = _femto_predict_batch(self.window_stats[rows], self.accumulated[rows])
+        median = np.median(predictions)
         # FIX: Increased Max Limit to 40 to accommodate heavy workload
         return max(5, min(int(median), 40))
 
     def run(self):
+        self.reset()
         time = 0
-        queue = []
-        procs = sorted(self.processes, key=lambda x: x.arrival_time)
+        queue = deque()
+        procs = self._sorted_procs
+        n_procs = len(procs)
+        n_total = len(self.processes)
+        completed = 0
         p_idx = 0
+        next_arrival = procs[0].arrival_time if procs else float('inf')
+        # Quantum of the current ready set; None once the set or any of its
+        # predictions has changed and the median must be recomputed
+        tq = None
         
-        while len(self.completed_processes) < len(self.processes):
-            while p_idx < len(procs) and procs[p_idx].arrival_time <= time:
-                # Reset accumulator on arrival
-                procs[p_idx].current_burst_accumulated = 0
-                queue.append(procs[p_idx])
-                p_idx += 1
+        while completed < n_total:
+            # Only scan for arrivals once the next one is actually due
+            if time >= next_arrival:
+                while p_idx < n_procs and procs[p_idx].arrival_time <= time:
+                    # Reset accumulator on arrival
+                    procs[p_idx].current_burst_accumulated = 0
+                    self.accumulated[procs[p_idx].femto_row] = 0
+                    queue.append(procs[p_idx])
+                    p_idx += 1
+                next_arrival = procs[p_idx].arrival_time if p_idx < n_procs else float('inf')
+                tq = None
                 
             if not queue:
-                time += 1
+                # CPU idle: jump straight to the next arrival
+                if p_idx == n_procs: break
+                time = next_arrival
                 continue
 
-            tq = self.calculate_system_quantum(queue)
+            if tq is None:
+                tq = self.calculate_system_quantum(queue)
             
             self.context_switches += 1
-            p = queue.pop(0)
+            p = queue.popleft()
             if p.start_time == -1: p.start_time = time
+            predicted = self.femto_predict(p)
             
             run_time = min(p.remaining_time, tq)
             time += run_time
@@ -308,11 +532,13 @@ class FemtoScheduler(Scheduler):
             
             # FIX: Accumulate runtime
             p.current_burst_accumulated += run_time
+            self.accumulated[p.femto_row] = p.current_burst_accumulated
             
             if p.remaining_time == 0:
                 # FIX: Only update history when burst finishes
-                p.burst_history.append(p.current_burst_accumulated)
+                self.record_burst(p, p.current_burst_accumulated)
                 p.current_burst_accumulated = 0 
+                self.accumulated[p.femto_row] = 0
                 
                 p.current_burst_index += 1
                 if p.current_burst_index < len(p.bursts):
@@ -321,5 +547,14 @@ class FemtoScheduler(Scheduler):
                 else:
                     p.completion_time = time
                     self.completed_processes.append(p)
+                    completed += 1
+                tq = None
             else:
-                queue.append(p)
\ No newline at end of file
+                # Only p's accumulated time moved; the other predictions hold
+                if self.femto_predict(p) != predicted:
+                    tq = None
+                queue.append(p)
+
+if __name__ == "__main__":
+    check_rr_kernel()
+    print("Round Robin kernel matches the Python loop")
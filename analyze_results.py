@@ -3,10 +3,31 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import glob
 import os
+import re
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # Optional: without pyarrow the CSVs go through pandas' own parser
+    pa = None
 
 # Configuration
 RESULT_DIR = "results"
 OUTPUT_REPORT = "final_analysis_report.txt"
+_METRICS_FILE = re.compile(r'metrics_(\d+)_processes\.csv$')
+
+if pa is not None:
+    # Column types of the files written by main.save_to_csv, so pyarrow has nothing to infer
+    _METRICS_OPTIONS = pacsv.ConvertOptions(column_types={
+        'Name': pa.string(), 'Avg_TAT': pa.float64(), 'Avg_WT': pa.float64(), 'Avg_RT': pa.float64(),
+        'Throughput': pa.float64(), 'CPU_Util': pa.float64(), 'Ctx_Switch': pa.int64(),
+    })
+
+def read_metrics(filename):
+    """Reads one metrics CSV (through pyarrow when it is installed)."""
+    if pa is not None:
+        return pacsv.read_csv(filename, convert_options=_METRICS_OPTIONS).to_pandas()
+    return pd.read_csv(filename)
 
 def load_data():
     """Reads all CSV files from the results directory and combines them."""
@@ -16,25 +37,32 @@ def load_data():
         print("Error: No CSV files found in 'results/'. Run main.py first.")
         return None
 
-    df_list = []
+    frames = {}
     for filename in all_files:
         try:
             # Extract process count from filename (e.g., 'metrics_400_processes.csv')
-            # Assuming format: metrics_{NUMBER}_processes.csv
-            base = os.path.basename(filename)
-            proc_count = int(base.split('_')[1])
-            
-            df = pd.read_csv(filename)
-            df['Load'] = proc_count
-            df_list.append(df)
+            proc_count = int(_METRICS_FILE.search(filename).group(1))
+            frames[proc_count] = read_metrics(filename)
         except Exception as e:
             print(f"Skipping {filename}: {e}")
 
-    if not df_list:
+    if not frames:
         return None
 
-    combined_df = pd.concat(df_list, ignore_index=True)
-    return combined_df.sort_values(by=['Load', 'Name'])
+    # The dict keys become the 'Load' column; the pivots downstream don't need sorted rows
+    return pd.concat(frames, names=['Load']).reset_index(level=0).reset_index(drop=True)
+
+def pick_algorithms(subset, *keys):
+    """Returns, for each key, the first row whose Name contains it (one pass over the names)."""
+    found = {}
+    for pos, name in enumerate(subset['Name'].tolist()):
+        for key in keys:
+            if key not in found and key in name:
+                found[key] = pos
+    missing = [key for key in keys if key not in found]
+    if missing:
+        raise IndexError(f"No algorithm matching {missing}")
+    return [subset.iloc[found[key]] for key in keys]
 
 def generate_text_report(df):
     """Generates a textual analysis of Femto vs Standards."""
@@ -45,10 +73,7 @@ def generate_text_report(df):
     
     # Identify Algorithms (Adjust strings to match your main.py names)
     try:
-        femto = subset[subset['Name'].str.contains("Femto")].iloc[0]
-        rr5 = subset[subset['Name'].str.contains("Q=5")].iloc[0]
-        rr20 = subset[subset['Name'].str.contains("Q=20")].iloc[0]
-        srtf = subset[subset['Name'].str.contains("SRTF")].iloc[0]
+        femto, rr5, rr20, srtf = pick_algorithms(subset, "Femto", "Q=5", "Q=20", "SRTF")
     except IndexError:
         print("Could not find required algorithms for comparison.")
         return
@@ -110,9 +135,7 @@ def plot_comparative_gains(df):
     max_load = df['Load'].max()
     subset = df[df['Load'] == max_load]
     
-    femto = subset[subset['Name'].str.contains("Femto")].iloc[0]
-    rr5 = subset[subset['Name'].str.contains("Q=5")].iloc[0]
-    rr20 = subset[subset['Name'].str.contains("Q=20")].iloc[0]
+    femto, rr5, rr20 = pick_algorithms(subset, "Femto", "Q=5", "Q=20")
     
     # Data for plotting
     metrics = ['Context Switches', 'Response Time']
@@ -1,8 +1,18 @@
+import matplotlib
+matplotlib.use('Agg') # Charts are only saved to files, so skip GUI backend start-up
 import matplotlib.pyplot as plt
-import copy
 import numpy as np
+import pandas as pd
 import os
 import csv
+import argparse
+import io
+import sys
+from contextlib import redirect_stdout
+import pickle
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+import workload
 from workload import generate_smart_workload
 from algorithms import FCFS, SJF, SRTF, RoundRobin, PriorityRR, FemtoScheduler
 
@@ -11,35 +21,36 @@ OUTPUT_DIR = "results"
 if not os.path.exists(OUTPUT_DIR):
     os.makedirs(OUTPUT_DIR)
 
+# Generated datasets, keyed by (n, seed) and the workload.py source they came from
+CACHE_DIR = os.path.join(OUTPUT_DIR, "cache")
+with open(workload.__file__, 'rb') as _src:
+    WORKLOAD_VERSION = hashlib.sha256(_src.read()).hexdigest()[:12]
+
+# Column order of the metrics CSVs (the keys of calculate_metrics' dict)
+_FIELDS = ('Name', 'Avg_TAT', 'Avg_WT', 'Avg_RT', 'Throughput', 'CPU_Util', 'Ctx_Switch')
+
 def calculate_metrics(scheduler_obj):
     completed = scheduler_obj.completed_processes
     n = len(completed)
     
-    total_tat = 0
-    total_wt = 0
-    total_rt = 0
-    total_burst_time = 0
-    max_completion_time = 0
-    
-    for p in completed:
-        tat = p.completion_time - p.arrival_time
-        proc_total_burst = sum(p.bursts)
-        wt = tat - proc_total_burst
-        rt = p.start_time - p.arrival_time
-        
-        total_tat += tat
-        total_wt += wt
-        total_rt += rt
-        total_burst_time += proc_total_burst
-        
-        if p.completion_time > max_completion_time:
-            max_completion_time = p.completion_time
-
     if n == 0: return {}
 
-    avg_tat = total_tat / n
-    avg_wt = total_wt / n
-    avg_rt = total_rt / n
+    # One array per field, then the whole aggregation runs in NumPy
+    arrival = np.fromiter((p.arrival_time for p in completed), dtype=np.int64, count=n)
+    start = np.fromiter((p.start_time for p in completed), dtype=np.int64, count=n)
+    completion = np.fromiter((p.completion_time for p in completed), dtype=np.int64, count=n)
+    total_burst = np.fromiter((p.total_burst for p in completed), dtype=np.int64, count=n)
+    
+    tat = completion - arrival
+    wt = tat - total_burst
+    rt = start - arrival
+    
+    total_burst_time = int(total_burst.sum())
+    max_completion_time = int(completion.max())
+
+    avg_tat = int(tat.sum()) / n
+    avg_wt = int(wt.sum()) / n
+    avg_rt = int(rt.sum()) / n
     throughput = n / max_completion_time if max_completion_time > 0 else 0
     utilization = (total_burst_time / max_completion_time) * 100 if max_completion_time > 0 else 0
 
@@ -55,11 +66,11 @@ def calculate_metrics(scheduler_obj):
 
 def save_to_csv(results, process_count):
     filename = os.path.join(OUTPUT_DIR, f"metrics_{process_count}_processes.csv")
-    keys = results[0].keys()
-    with open(filename, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=keys)
-        writer.writeheader()
-        writer.writerows(results)
+    rows = [tuple(r[k] for k in _FIELDS) for r in results]
+    with open(filename, 'w', newline='', buffering=65536) as f:
+        writer = csv.writer(f)
+        writer.writerow(_FIELDS)
+        writer.writerows(rows)
     print(f"   [Saved CSV]: {filename}")
 
 def plot_dashboard(results, process_count):
@@ -71,7 +82,8 @@ def plot_dashboard(results, process_count):
     utilization = [r['CPU_Util'] for r in results]
     ctx = [r['Ctx_Switch'] for r in results]
 
-    fig, axs = plt.subplots(2, 2, figsize=(16, 10))
+    # Constrained layout is solved as part of the draw, no separate tight_layout pass
+    fig, axs = plt.subplots(2, 2, figsize=(16, 10), constrained_layout=True)
     fig.suptitle(f'Performance Analysis: {process_count} Processes (Heavy Burst)', fontsize=16)
     x = np.arange(len(names))
     width = 0.25
@@ -116,15 +128,37 @@ def plot_dashboard(results, process_count):
     ax4.set_xticks(x)
     ax4.set_xticklabels(names, rotation=20, ha="right", fontsize=8)
 
-    plt.tight_layout(rect=[0, 0.03, 1, 0.95])
-    
     # Save instead of show
     save_path = os.path.join(OUTPUT_DIR, f"dashboard_{process_count}_procs.png")
-    plt.savefig(save_path)
+    fig.savefig(save_path) # Not plt.savefig: that redraws the whole canvas again afterwards
     print(f"   [Saved Plot]: {save_path}")
-    plt.close() # Close figure to free memory
+    plt.close(fig) # Close figure to free memory
 
-def plot_scalability_analysis(history, process_counts):
+def plot_scalability_chart(metric_table, metric_key, title, ylabel):
+    # metric_table: one row per load, one column per algorithm
+    fig = plt.figure(figsize=(10, 6))
+    
+    # Iterate over each algorithm
+    for algo_name, y_values in metric_table.items():
+        # Style Femto distinctively
+        if "Femto" in algo_name:
+            plt.plot(metric_table.index, y_values, marker='o', linewidth=3, label=algo_name, color='red')
+        else:
+            plt.plot(metric_table.index, y_values, marker='x', linestyle='--', label=algo_name, alpha=0.7)
+    
+    plt.xlabel('Number of Processes (Load)')
+    plt.ylabel(ylabel)
+    plt.title(f'Scalability Analysis: {title}')
+    plt.legend()
+    plt.grid(True)
+    
+    save_path = os.path.join(OUTPUT_DIR, f"scalability_{metric_key}.png")
+    fig.savefig(save_path)
+    print(f"   [Saved Scalability Chart]: {save_path}")
+    plt.close(fig)
+
+def plot_scalability_analysis(hist_df, executor=None):
+    """hist_df: one row per (Load, Name) run, with the calculate_metrics columns."""
     print("\n--- 5. Generating Scalability Analysis Charts ---")
     
     # We want 4 charts: Switches, Response, Wait, Turnaround
@@ -135,75 +169,103 @@ def plot_scalability_analysis(history, process_counts):
         ('Avg_TAT', 'Avg Turnaround Time', 'Ticks')
     ]
     
-    for metric_key, title, ylabel in metrics_to_plot:
-        plt.figure(figsize=(10, 6))
-        
-        # Iterate over each algorithm
-        for algo_name, metrics in history.items():
-            # Extract the specific metric data for this algo across all process counts
-            y_values = [m[metric_key] for m in metrics]
-            
-            # Style Femto distinctively
-            if "Femto" in algo_name:
-                plt.plot(process_counts, y_values, marker='o', linewidth=3, label=algo_name, color='red')
-            else:
-                plt.plot(process_counts, y_values, marker='x', linestyle='--', label=algo_name, alpha=0.7)
-        
-        plt.xlabel('Number of Processes (Load)')
-        plt.ylabel(ylabel)
-        plt.title(f'Scalability Analysis: {title}')
-        plt.legend()
-        plt.grid(True)
-        
-        save_path = os.path.join(OUTPUT_DIR, f"scalability_{metric_key}.png")
-        plt.savefig(save_path)
-        print(f"   [Saved Scalability Chart]: {save_path}")
-        plt.close()
-
-def main():
-    # Global history storage for final comparisons
-    # Structure: { "AlgoName": [ {result_dict_10}, {result_dict_20}, ... ] }
-    global_history = {}
+    # One load-by-algorithm table per metric; columns keep the run order for the legend
+    algo_names = hist_df['Name'].unique()
+    tables = {metric_key: hist_df.pivot(index='Load', columns='Name', values=metric_key)[algo_names]
+              for metric_key, _, _ in metrics_to_plot}
     
-    process_count_list = [10, 20, 50, 100, 200, 400]
+    # The charts are independent: render them side by side when given a pool
+    if executor is None:
+        for metric_key, title, ylabel in metrics_to_plot:
+            plot_scalability_chart(tables[metric_key], metric_key, title, ylabel)
+    else:
+        charts = [executor.submit(plot_scalability_chart, tables[metric_key], metric_key, title, ylabel)
+                  for metric_key, title, ylabel in metrics_to_plot]
+        for chart in charts:
+            chart.result()
+
+def load_workload(n, seed):
+    """Returns the seeded workload for n processes, generating and caching it on first use."""
+    path = os.path.join(CACHE_DIR, f"ds_{n}_{seed}_{WORKLOAD_VERSION}.pkl")
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        pass # Missing, truncated or stale (e.g. Process changed shape): regenerate it
     
-    for process_count in process_count_list:
+    dataset = generate_smart_workload(n=n, seed=seed)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # Write then rename, so an interrupted run never leaves a truncated cache file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(dataset, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    return dataset
+
+def build_schedulers(process_count):
+    # Seeded by load, so every run of the sweep sees the same workload per load
+    dataset = load_workload(process_count, seed=process_count)
+    # Every scheduler clones the dataset, so one workload serves all policies
+    return [
+        FCFS(dataset),
+        SJF(dataset),
+        SRTF(dataset),
+        PriorityRR(dataset, quantum=4),
+        RoundRobin(dataset, quantum=5),
+        RoundRobin(dataset, quantum=20),
+        FemtoScheduler(dataset)
+    ]
+
+def run_and_measure(sched):
+    sched.run()
+    return calculate_metrics(sched)
+
+def save_load_results(results, process_count, plots=True):
+    """Saves one load's CSV (and dashboard, if plots) and prints its summary."""
+    # The load's lines are collected and written in one go, so the blocks
+    # printed by parallel workers don't interleave
+    buf = io.StringIO()
+    with redirect_stdout(buf):
         print(f"\n--- Processing Load: {process_count} Processes ---")
-        dataset = generate_smart_workload(n=process_count) 
-        
-        schedulers = [
-            FCFS(copy.deepcopy(dataset)),
-            SJF(copy.deepcopy(dataset)),
-            SRTF(copy.deepcopy(dataset)),
-            PriorityRR(copy.deepcopy(dataset), quantum=4),
-            RoundRobin(copy.deepcopy(dataset), quantum=5),
-            RoundRobin(copy.deepcopy(dataset), quantum=20),
-            FemtoScheduler(copy.deepcopy(dataset))
-        ]
-
-        # Run this iteration
-        results = []
-        for sched in schedulers:
-            sched.run()
-            res = calculate_metrics(sched)
-            results.append(res)
-            
-            # Store for global history
-            if res['Name'] not in global_history:
-                global_history[res['Name']] = []
-            global_history[res['Name']].append(res)
-
-        # Save Iteration Data
         save_to_csv(results, process_count)
-        plot_dashboard(results, process_count)
+        if plots:
+            plot_dashboard(results, process_count)
         
         # Console Summary for this iteration
         print(f"   > Best Wait Time: {min(results, key=lambda x: x['Avg_WT'])['Name']}")
         print(f"   > Fewest Switches: {min(results, key=lambda x: x['Ctx_Switch'])['Name']}")
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
+    return results
+
+def main(mode="sweep"):
+    # "sweep": CSVs, dashboards and scalability charts; "csv": the CSVs only
+    plots = mode == "sweep"
+    
+    # Every run's metrics, tagged with its load, for the final comparisons
+    all_results = []
+    
+    process_count_list = [10, 20, 50, 100, 200, 400]
+    
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+        # Every (load, policy) run is its own task, so the heavy loads are
+        # spread over all workers instead of tying one up per load
+        runs = {pc: [ex.submit(run_and_measure, s) for s in build_schedulers(pc)]
+                for pc in process_count_list}
+        # A load's CSV and dashboard are written by a worker once its runs are in
+        saved = [ex.submit(save_load_results, [f.result() for f in runs[pc]], pc, plots)
+                 for pc in process_count_list]
+        
+        for pc, fut in zip(process_count_list, saved):
+            all_results.extend({**res, 'Load': pc} for res in fut.result())
 
-    # --- Final Cross-Comparison Visualization ---
-    plot_scalability_analysis(global_history, process_count_list)
+        # --- Final Cross-Comparison Visualization ---
+        if plots:
+            plot_scalability_analysis(pd.DataFrame(all_results), executor=ex)
     print(f"\n[DONE] All results saved in directory: '{OUTPUT_DIR}/'")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run the scheduler load sweep.")
+    parser.add_argument("--mode", choices=["sweep", "csv"], default="sweep",
+                        help="'csv' writes the metrics files without rendering any chart")
+    main(parser.parse_args().mode)
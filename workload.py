@@ -1,13 +1,30 @@
-import random
+from itertools import chain
+
+import numpy as np
+
+# Default generator for workload draws (pass a seed for a reproducible one)
+_RNG = np.random.default_rng()
 
 class Process:
-    def __init__(self, pid, arrival_time, behavior):
+    # Fixed attribute set: no per-instance __dict__, faster attribute access
+    __slots__ = ('pid', 'arrival_time', 'behavior', 'bursts', 'total_burst', 'priority',
+                 'current_burst_index', 'remaining_time', 'start_time',
+                 'finish_time', 'completion_time', 'burst_history',
+                 'current_burst_accumulated', 'is_volatile',
+                 'femto_row') # Set by FemtoScheduler: row in its per-process arrays
+
+    def __init__(self, pid, arrival_time, behavior, rng=None):
+        rng = _RNG if rng is None else rng
         self.pid = pid
         self.arrival_time = arrival_time
         self.behavior = behavior
-        self.bursts = self._generate_bursts()
-        self.priority = random.randint(1, 5)
-        
+        self.bursts = self._generate_bursts(rng)
+        self.total_burst = sum(self.bursts) # Bursts never change after generation
+        self.priority = int(rng.integers(1, 6))
+        self.reset_state()
+
+    def reset_state(self):
+        """Puts the process back to unscheduled: first burst pending, no history."""
         # State variables
         self.current_burst_index = 0
         self.remaining_time = 0 if not self.bursts else self.bursts[0]
@@ -18,36 +35,78 @@ class Process:
         # Femto-Window Context
         self.burst_history = [] 
         self.current_burst_accumulated = 0 # NEW: Tracks partial execution
-        self.predicted_next = 0
         self.is_volatile = False
 
-    def _generate_bursts(self):
+    def clone(self):
+        """Returns an unscheduled copy that shares this process's (read-only) bursts."""
+        p = Process.__new__(Process)
+        p.pid = self.pid
+        p.arrival_time = self.arrival_time
+        p.behavior = self.behavior
+        p.bursts = self.bursts
+        p.total_burst = self.total_burst
+        p.priority = self.priority
+        p.reset_state()
+        return p
+
+    def _generate_bursts(self, rng):
+        # One vectorised draw per behaviour; integers(low, high) excludes high
         # Increased count slightly
-        count = random.randint(8, 12)
+        count = int(rng.integers(8, 13))
         bursts = []
         
         if self.behavior == "STABLE":
             # HEAVY WORKLOAD FIX: Base is now 30-60 (was 5-15)
             # This forces RR(Q=5) to switch 6-12 times per burst
-            base = random.randint(30, 60)
-            bursts = [max(1, base + random.randint(-5, 5)) for _ in range(count)]
+            base = rng.integers(30, 61)
+            bursts = np.maximum(1, base + rng.integers(-5, 6, size=count)).tolist()
             
         elif self.behavior == "RAMPING":
-            start = random.randint(5, 10)
-            bursts = [start + (i * 5) for i in range(count)]
+            start = rng.integers(5, 11)
+            bursts = (start + np.arange(count) * 5).tolist()
             
         elif self.behavior == "VOLATILE":
             # Mix of very short (interactive) and long (processing)
-            bursts = [random.choice([random.randint(2, 5), random.randint(40, 80)]) for _ in range(count)]
+            short = rng.integers(2, 6, size=count)
+            long = rng.integers(40, 81, size=count)
+            bursts = np.where(rng.random(count) < 0.5, short, long).tolist()
             
         return bursts
 
-def generate_smart_workload(n=20):
-    data = []
-    current_time = 0
-    for i in range(n):
-        b_type = random.choice(["STABLE", "STABLE", "RAMPING", "VOLATILE"])
-        p = Process(f"P{i}", current_time, b_type)
-        data.append(p)
-        current_time += random.randint(1, 3) 
-    return data
\ No newline at end of file
+class ProcessArray:
+    """Struct-of-arrays snapshot of a process list, for compiled scheduler kernels."""
+    def __init__(self, processes):
+        n = len(processes)
+        self.arrival = np.fromiter((p.arrival_time for p in processes), dtype=np.int64, count=n)
+        
+        # Bursts are flattened: process i owns bursts[burst_offsets[i]:burst_offsets[i + 1]]
+        lengths = np.fromiter((len(p.bursts) for p in processes), dtype=np.int64, count=n)
+        self.burst_offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.burst_offsets[1:])
+        self.bursts = np.fromiter(chain.from_iterable(p.bursts for p in processes),
+                                  dtype=np.int64, count=int(self.burst_offsets[-1]))
+        
+        # Mutable state, advanced by a kernel and copied back by store_results()
+        self.burst_index = np.fromiter((p.current_burst_index for p in processes), dtype=np.int64, count=n)
+        self.remaining = np.fromiter((p.remaining_time for p in processes), dtype=np.int64, count=n)
+        self.start = np.fromiter((p.start_time for p in processes), dtype=np.int64, count=n)
+        self.completion = np.fromiter((p.completion_time for p in processes), dtype=np.int64, count=n)
+
+    def store_results(self, processes):
+        """Write the state arrays back onto the Process objects they came from."""
+        for p, idx, rem, st, ct in zip(processes, self.burst_index.tolist(), self.remaining.tolist(),
+                                       self.start.tolist(), self.completion.tolist()):
+            p.current_burst_index = idx
+            p.remaining_time = rem
+            p.start_time = st
+            p.completion_time = ct
+
+def generate_smart_workload(n=20, seed=None):
+    # Same seed, same workload; without one, draws continue from the shared generator
+    rng = _RNG if seed is None else np.random.default_rng(seed)
+    
+    # Whole workload in one pass: behaviours and 1-3 tick inter-arrival gaps
+    behaviors = rng.choice(["STABLE", "STABLE", "RAMPING", "VOLATILE"], size=n).tolist()
+    gaps = rng.integers(1, 4, size=n)
+    arrivals = np.concatenate(([0], np.cumsum(gaps[:-1]))).tolist()
+    return [Process(f"P{i}", arrivals[i], behaviors[i], rng) for i in range(n)]